@@ -0,0 +1,17 @@
+from .core import (
+    convert_to_mp3,
+    create_downloader,
+    download,
+    generate_unique_filename,
+    reencode_to_mp4,
+    sanitize_filename,
+)
+
+__all__ = [
+    'convert_to_mp3',
+    'create_downloader',
+    'download',
+    'generate_unique_filename',
+    'reencode_to_mp4',
+    'sanitize_filename',
+]
@@ -0,0 +1,358 @@
+import argparse
+import logging
+import os
+import pathlib
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rich.logging import RichHandler
+from rich.progress import (
+    BarColumn, DownloadColumn, Progress, TextColumn, TimeRemainingColumn, TransferSpeedColumn,
+)
+
+from .core import (
+    MP3_VBR_QUALITIES,
+    VIDEO_QUALITY_FORMATS,
+    X264_PRESETS,
+    convert_to_mp3,
+    create_downloader,
+    download,
+    ffmpeg_available,
+    generate_unique_filename,
+    has_mp4_compatible_streams,
+    is_mp4_file,
+    is_youtube_url,
+    reencode_to_mp4,
+    remux_to_mp4,
+)
+
+def make_progress_hook(progress):
+    """
+    Build a yt-dlp progress hook that draws each downloaded file as a rich progress bar.
+    Updates are throttled to ten a second so redrawing does not slow the download down.
+    """
+    tasks = {}
+    last_update = {}
+
+    def hook(d):
+        filename = d.get('filename')
+        if filename not in tasks:
+            tasks[filename] = progress.add_task(pathlib.Path(filename).name, total=None)
+            last_update[filename] = 0.0
+        total = d.get('total_bytes') or d.get('total_bytes_estimate')
+        if d['status'] == 'downloading':
+            now = time.monotonic()
+            if now - last_update[filename] > 0.1:
+                last_update[filename] = now
+                progress.update(tasks[filename], completed=d.get('downloaded_bytes', 0), total=total)
+        else:  # 'finished' or 'error'
+            if d['status'] == 'finished':
+                downloaded = d.get('downloaded_bytes', 0)
+                progress.update(tasks[filename], completed=downloaded, total=total or downloaded)
+            del tasks[filename], last_update[filename]
+
+    return hook
+
+def clear_progress(progress):
+    """
+    Remove finished bars so they are not drawn again the next time the display starts.
+    """
+    for task_id in progress.task_ids:
+        progress.remove_task(task_id)
+
+def get_downloader(downloaders, download_path, format_choice, video_quality, progress_hook):
+    """
+    Return the calling thread's YoutubeDL instance for this kind of download, creating it on first use.
+    Reusing instances skips yt-dlp's extractor and JS interpreter setup on every download, and keying
+    them by thread keeps parallel downloads from sharing one instance.
+    """
+    key = (threading.get_ident(), format_choice, video_quality)
+    if key not in downloaders:
+        downloaders[key] = create_downloader(download_path, format_choice, video_quality, progress_hook)
+    return downloaders[key]
+
+def close_downloaders(downloaders):
+    """
+    Close every YoutubeDL instance created by get_downloader.
+    """
+    for ydl in downloaders.values():
+        ydl.close()
+    downloaders.clear()
+
+def process_url(url, download_path, format_choice, downloaders, progress_hook, audio_quality='medium',
+                video_quality=None, keep_m4a=False, quality=None):
+    """
+    Download a single URL and convert it to the requested format.
+    """
+    ydl = get_downloader(downloaders, download_path, format_choice, video_quality, progress_hook)
+    file_path, title = download(ydl, url)
+    if not (file_path and title):
+        return
+
+    if format_choice == 'mp3' and keep_m4a:
+        m4a_file = generate_unique_filename(download_path, title, 'm4a')
+        os.replace(file_path, m4a_file)
+        logging.info(f"M4A file saved as: {m4a_file}")
+    elif format_choice == 'mp3':
+        logging.info(f"Attempting to convert {file_path} to MP3...")
+        mp3_file = convert_to_mp3(file_path, download_path, title, audio_quality)
+        if mp3_file:
+            logging.info(f"MP3 file saved as: {mp3_file}")
+        else:
+            logging.error("Failed to convert to MP3.")
+
+        file_path.unlink(missing_ok=True)
+    else:
+        output_file = generate_unique_filename(download_path, title, 'mp4')
+        if has_mp4_compatible_streams(file_path):
+            if is_mp4_file(file_path):
+                # yt-dlp's merger already wrote a faststart MP4, so move it into place without another pass
+                os.replace(file_path, output_file)
+                saved_file = output_file
+            else:
+                # H.264/AAC in another container only needs its streams copied into an MP4
+                saved_file = remux_to_mp4(file_path, output_file)
+        else:
+            # Otherwise re-encode the file to ensure compatibility
+            saved_file = reencode_to_mp4(file_path, output_file, quality)
+
+        if saved_file:
+            file_path.unlink(missing_ok=True)
+            logging.info(f"MP4 file saved as: {output_file}")
+        else:
+            logging.error("Failed to convert to MP4.")
+            output_file.unlink(missing_ok=True)
+
+def read_batch_file(batch_file):
+    """
+    Read URLs from a batch file, skipping blank lines and # comments.
+    """
+    with open(batch_file, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def prompt_choice(prompt, choices):
+    """
+    Prompt until the user enters one of the choices.
+    """
+    while True:
+        choice = input(f"{prompt} ({'/'.join(choices)}): ").strip().lower()
+        if choice in choices:
+            return choice
+        logging.error(f"Invalid choice. Please choose one of: {', '.join(choices)}.")
+
+def prompt_user_input(keep_m4a):
+    """
+    Prompt user for input and return the values.
+    """
+    while True:
+        url = input("Enter the URL of the YouTube video: ").strip()
+        if is_youtube_url(url):
+            break
+        logging.error("Invalid YouTube URL. Please provide a valid URL.")
+
+    format_choice = prompt_choice("Choose format", ['mp3', 'mp4'])
+
+    audio_quality = 'medium'
+    video_quality = None
+    if format_choice == 'mp3' and not keep_m4a:
+        audio_quality = prompt_choice("Choose audio quality", list(MP3_VBR_QUALITIES))
+    elif format_choice == 'mp4':
+        video_quality = prompt_choice("Choose video quality", [*VIDEO_QUALITY_FORMATS, 'best'])
+
+    return url, format_choice, audio_quality, video_quality
+
+def warm_up_connection():
+    """
+    Contact youtube.com in the background so DNS resolution is already cached when the first download starts.
+    """
+    def fetch():
+        try:
+            with urllib.request.urlopen("https://www.youtube.com/", timeout=3) as response:
+                response.read(1024)
+        except Exception:
+            # Best effort only, the download reports any real network problem
+            pass
+
+    threading.Thread(target=fetch, daemon=True).start()
+
+def run_wizard(args, download_path, progress):
+    """
+    Interactively prompt for videos to download until the user is done.
+    """
+    # Overlap the cold connection setup with the time the user spends typing the URL
+    warm_up_connection()
+    progress_hook = make_progress_hook(progress)
+    downloaders = {}
+    try:
+        while True:
+            url, format_choice, audio_quality, video_quality = prompt_user_input(args.keep_m4a)
+            with progress:
+                process_url(url, download_path, format_choice, downloaders, progress_hook, audio_quality,
+                            video_quality, args.keep_m4a, args.quality)
+            clear_progress(progress)
+
+            if prompt_choice("Do you want to download another video?", ['yes', 'no']) != 'yes':
+                break
+    finally:
+        close_downloaders(downloaders)
+
+def collect_urls(args):
+    """
+    Gather the valid YouTube URLs from the command line and the batch file.
+    Repeated URLs are dropped, as two workers downloading the same video would overwrite each other's files.
+    """
+    urls = list(args.urls)
+    if args.batch_file:
+        urls.extend(read_batch_file(args.batch_file))
+    urls = list(dict.fromkeys(urls))
+    for url in urls:
+        if not is_youtube_url(url):
+            logging.error(f"Skipping invalid YouTube URL: {url}")
+    return [url for url in urls if is_youtube_url(url)]
+
+def run_download(args, download_path, progress):
+    """
+    Download the URLs given on the command line or in a batch file in parallel.
+    """
+    urls = args.urls
+    progress_hook = make_progress_hook(progress)
+    downloaders = {}
+    logging.info(f"Downloading {len(urls)} URLs with {args.workers} workers...")
+    try:
+        # Downloads are network bound, so threads overlap them despite the GIL
+        with progress, ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = {
+                executor.submit(process_url, url, download_path, args.format, downloaders, progress_hook,
+                                args.audio_quality, args.video_quality, args.keep_m4a, args.quality): url
+                for url in urls
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"Failed to process {futures[future]}: {e}")
+    finally:
+        close_downloaders(downloaders)
+
+def run_convert(args, download_path, progress):
+    """
+    Convert a local media file to MP3 or MP4 next to the original.
+    """
+    input_file = args.input_file
+    if args.format == 'mp3':
+        mp3_file = convert_to_mp3(input_file, input_file.parent, input_file.stem, args.audio_quality)
+        if mp3_file:
+            logging.info(f"MP3 file saved as: {mp3_file}")
+        else:
+            logging.error("Failed to convert to MP3.")
+    elif not has_mp4_compatible_streams(input_file):
+        output_file = generate_unique_filename(input_file.parent, input_file.stem, 'mp4')
+        if reencode_to_mp4(input_file, output_file, args.quality):
+            logging.info(f"MP4 file saved as: {output_file}")
+        else:
+            logging.error("Failed to re-encode MP4 file.")
+            output_file.unlink(missing_ok=True)
+    elif is_mp4_file(input_file):
+        logging.info(f"{input_file} is already an H.264/AAC MP4, nothing to do.")
+    else:
+        output_file = generate_unique_filename(input_file.parent, input_file.stem, 'mp4')
+        if remux_to_mp4(input_file, output_file):
+            logging.info(f"MP4 file saved as: {output_file}")
+        else:
+            logging.error("Failed to remux MP4 file.")
+            output_file.unlink(missing_ok=True)
+
+def positive_int(value):
+    """
+    Parse a command line value that must be a whole number above zero.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def build_parser():
+    """
+    Build the command line parser with its wizard, download and convert subcommands.
+    """
+    parser = argparse.ArgumentParser(prog='ytmedia', description="Download YouTube videos as MP3 or MP4.")
+    subparsers = parser.add_subparsers(dest='command')
+
+    quality_options = argparse.ArgumentParser(add_help=False)
+    quality_options.add_argument('--quality', choices=list(X264_PRESETS),
+                                 help="libx264 re-encode quality; higher is slower (default: fastest)")
+
+    audio_options = argparse.ArgumentParser(add_help=False)
+    audio_options.add_argument('--keep-m4a', action='store_true',
+                               help="keep audio downloads as M4A instead of converting them to MP3")
+
+    wizard = subparsers.add_parser('wizard', parents=[quality_options, audio_options],
+                                   help="prompt for videos to download (default)")
+    wizard.set_defaults(func=run_wizard)
+
+    download_parser = subparsers.add_parser('download', parents=[quality_options, audio_options],
+                                            help="download URLs without prompting")
+    download_parser.add_argument('urls', nargs='*', metavar='URL', help="YouTube URLs to download")
+    download_parser.add_argument('--batch-file', type=pathlib.Path,
+                                 help="also download every URL listed in this file (one per line)")
+    download_parser.add_argument('--format', choices=['mp3', 'mp4'], default='mp4',
+                                 help="format to save (default: mp4)")
+    download_parser.add_argument('--audio-quality', choices=list(MP3_VBR_QUALITIES), default='medium',
+                                 help="MP3 quality (default: medium)")
+    download_parser.add_argument('--video-quality', choices=list(VIDEO_QUALITY_FORMATS),
+                                 help="maximum video resolution (default: best)")
+    download_parser.add_argument('--workers', type=positive_int, default=4,
+                                 help="number of downloads to run in parallel (default: 4)")
+    download_parser.set_defaults(func=run_download)
+
+    convert = subparsers.add_parser('convert', parents=[quality_options],
+                                    help="convert a local file to MP3 or MP4")
+    convert.add_argument('input_file', type=pathlib.Path, help="file to convert")
+    convert.add_argument('--format', choices=['mp3', 'mp4'], default='mp3',
+                         help="format to convert to (default: mp3)")
+    convert.add_argument('--audio-quality', choices=list(MP3_VBR_QUALITIES), default='medium',
+                         help="MP3 quality (default: medium)")
+    convert.set_defaults(func=run_convert)
+
+    return parser
+
+def main(argv=None):
+    # Setup logging, routed through rich so messages print above the progress bars
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[RichHandler(show_path=False)])
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Without a subcommand, accept the options of the original single script: --batch-file
+    # runs a batch download and anything else starts the wizard
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        batch = any(arg.split('=')[0] == '--batch-file' for arg in argv)
+        argv = ['download' if batch else 'wizard', *argv]
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'download':
+        try:
+            args.urls = collect_urls(args)
+        except OSError as e:
+            parser.error(f"cannot read batch file: {e}")
+        if not args.urls:
+            parser.error("no valid YouTube URLs to download; give at least one URL or a --batch-file")
+
+    download_path = pathlib.Path.home() / "Downloads"
+    download_path.mkdir(parents=True, exist_ok=True)
+
+    if not ffmpeg_available():
+        logging.error("ffmpeg is not installed. Please install it to use this script.")
+        return
+
+    progress = Progress(
+        TextColumn("{task.description}"), BarColumn(), DownloadColumn(), TransferSpeedColumn(), TimeRemainingColumn(),
+    )
+    args.func(args, download_path, progress)
+
+if __name__ == "__main__":
+    main()
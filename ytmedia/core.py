@@ -0,0 +1,362 @@
+import functools
+import yt_dlp
+import pathlib
+import logging
+import glob
+import json
+import re
+from shutil import which
+import os
+import subprocess
+import threading
+
+# Maps every character that is invalid in a filename to an underscore
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Resolved once at import rather than on every use
+_FFMPEG_PATH = which("ffmpeg")
+_FFPROBE_PATH = which("ffprobe")
+
+# Accepts youtube.com (www, m and music subdomains) and youtu.be short links
+_YT_URL_RE = re.compile(r'^https?://(?:www\.|m\.|music\.)?(?:youtube\.com/|youtu\.be/)')
+
+# Playlist and channel pages, which would download every video instead of the single file callers expect
+_YT_PLAYLIST_RE = re.compile(r'^https?://(?:www\.|m\.|music\.)?youtube\.com/(?:playlist\b|@|channel/|c/|user/)')
+
+# Options shared by every download. Ranged 10 MiB requests side-step YouTube's per-connection
+# throttling, and DASH/HLS fragments are fetched in parallel. A watch URL with a list= parameter
+# downloads just that video, as every caller expects a single file. yt-dlp's own console output
+# is replaced by the progress bars and the logger set in build_ydl_opts.
+_YDL_COMMON_OPTS = {
+    'quiet': True,
+    'http_chunk_size': 10485760,
+    'retries': 10,
+    'fragment_retries': 10,
+    'concurrent_fragment_downloads': 8,
+    'noplaylist': True,
+}
+
+# yt-dlp format selector for each video quality choice
+VIDEO_QUALITY_FORMATS = {
+    '720p': 'bestvideo[height<=720]+bestaudio/best',
+    '1080p': 'bestvideo[height<=1080]+bestaudio/best',
+    '1440p': 'bestvideo[height<=1440]+bestaudio/best',
+}
+
+# LAME VBR quality (-q:a, lower is better) for each audio quality choice
+MP3_VBR_QUALITIES = {
+    'low': 6,
+    'medium': 2,
+    'high': 0,
+}
+
+# functools.cache does not stop parallel batch workers from probing at the same time
+_PROBE_LOCK = threading.RLock()
+
+# Matches the encoder name on each ' V....D name  description' line of 'ffmpeg -encoders'
+_ENCODER_LINE_RE = re.compile(r'^ [VAS][F.][S.][X.][B.][D.] ([\w-]+)', re.MULTILINE)
+
+# Encoder specific tuning passed to the output of the re-encode. libx264 is held to 8-bit 4:2:0,
+# as it would otherwise keep a 10-bit source as High 10 that many players cannot decode, and
+# NVENC's bitrate is uncapped so its default 2M does not starve the constant quality target.
+ENCODER_OPTIONS = {
+    'libx264': ['-crf', '22', '-tune', 'fastdecode', '-pix_fmt', 'yuv420p', '-threads', '0'],
+    'h264_nvenc': ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0'],
+    'h264_amf': ['-usage', 'transcoding', '-quality', 'balanced', '-rc', 'vbr_peak'],
+}
+
+# libx264 preset for each --quality choice, trading encode speed for compression
+X264_PRESETS = {
+    'low': 'ultrafast',
+    'medium': 'veryfast',
+    'high': 'slow',
+}
+
+# Decode on the GPU as well when encoding with NVENC
+HWACCEL_OPTIONS = {
+    'h264_nvenc': ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'],
+}
+
+class _YdlLogger:
+    """
+    Route yt-dlp's messages into logging. Warnings are logged as warnings, while errors stay
+    at debug level because download() already logs the DownloadError that follows them.
+    """
+    def debug(self, msg):
+        logging.debug(msg)
+
+    def info(self, msg):
+        logging.debug(msg)
+
+    def warning(self, msg):
+        logging.warning(msg)
+
+    def error(self, msg):
+        logging.debug(msg)
+
+def is_youtube_url(url):
+    """
+    Check whether the URL points at YouTube.
+    """
+    return _YT_URL_RE.match(url) is not None
+
+def sanitize_filename(title):
+    """
+    Sanitize the filename by replacing invalid characters.
+    """
+    return title.translate(_SANITIZE_TABLE)
+
+def build_ydl_opts(download_path, format_choice, video_quality=None, progress_hook=None):
+    """
+    Build the yt-dlp options for downloading video or audio.
+    """
+    ydl_opts = {**_YDL_COMMON_OPTS, 'logger': _YdlLogger()}
+    if format_choice == 'mp3':
+        ydl_opts.update({
+            # Prefer the AAC stream so extracting to M4A is a copy rather than a transcode
+            'format': 'bestaudio[ext=m4a]/bestaudio/best',
+            'outtmpl': str(download_path / 'audio_%(id)s.%(ext)s'),
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'm4a',
+                'preferredquality': '192',
+            }],
+        })
+    else:  # 'mp4'
+        ydl_opts.update({
+            'format': VIDEO_QUALITY_FORMATS.get(video_quality, 'bestvideo+bestaudio/best'),
+            'outtmpl': str(download_path / 'video_%(id)s.%(ext)s'),
+            'merge_output_format': 'mp4',
+        })
+    if progress_hook:
+        ydl_opts['progress_hooks'] = [progress_hook]
+    return ydl_opts
+
+def create_downloader(download_path, format_choice, video_quality=None, progress_hook=None):
+    """
+    Create a YoutubeDL instance that can be reused for many downloads of the same kind.
+    The caller is responsible for closing it.
+    """
+    return yt_dlp.YoutubeDL(build_ydl_opts(download_path, format_choice, video_quality, progress_hook))
+
+def find_downloaded_file(ydl, info):
+    """
+    Return the path of the file yt-dlp produced for a download, whatever container it ended up in.
+    """
+    requested = info.get('requested_downloads')
+    if requested and requested[0].get('filepath'):
+        return pathlib.Path(requested[0]['filepath'])
+
+    # Otherwise take the first file next to the expected name that ffprobe recognises as media,
+    # skipping partial downloads and unmerged .f<id> format streams
+    expected = pathlib.Path(ydl.prepare_filename(info))
+    for candidate in sorted(expected.parent.glob(f"{glob.escape(expected.stem)}.*")):
+        if candidate.stem != expected.stem or candidate.suffix in ('.part', '.ytdl'):
+            continue
+        try:
+            probe_media(candidate)
+        except subprocess.CalledProcessError:
+            continue
+        return candidate
+    return None
+
+def download(ydl, url):
+    """
+    Download video or audio from a YouTube video with a downloader from create_downloader.
+    """
+    if _YT_PLAYLIST_RE.match(url):
+        logging.error(f"Playlist and channel URLs are not supported, pass the video URLs instead: {url}")
+        return None, None
+    try:
+        # A single extraction both resolves the formats and downloads them
+        info = ydl.extract_info(url, download=True)
+    except yt_dlp.DownloadError as e:
+        logging.error(f"Download error: {e}")
+        return None, None
+
+    if info.get('_type') == 'playlist':
+        # Any other URL that turned out to be a playlist; remove the entries rather than leave them behind
+        for entry in info.get('entries') or []:
+            for requested in (entry or {}).get('requested_downloads') or []:
+                if requested.get('filepath'):
+                    pathlib.Path(requested['filepath']).unlink(missing_ok=True)
+        logging.error(f"Playlist and channel URLs are not supported, pass the video URLs instead: {url}")
+        return None, None
+
+    file_path = find_downloaded_file(ydl, info)
+    if file_path is None:
+        logging.error(f"Could not find the downloaded file for {url}.")
+        return None, None
+    title = info.get('title', 'video')
+    title = sanitize_filename(title)
+    logging.info("Download complete.")
+    return file_path, title
+
+def generate_unique_filename(output_path, title, extension):
+    """
+    Generate a unique filename by appending a number if the file already exists.
+    The file is created empty to reserve the name, so parallel downloads cannot pick the same one.
+    """
+    # One directory scan finds the highest suffix in use instead of probing each name in turn
+    suffix_re = re.compile(rf"{re.escape(title)}_(\d+)\.{re.escape(extension)}")
+    matches = (suffix_re.fullmatch(p.name) for p in output_path.glob(f"{glob.escape(title)}_*.{extension}"))
+    i = max((int(m.group(1)) for m in matches if m), default=0)
+
+    base_file = output_path / f"{title}.{extension}"
+    while True:
+        try:
+            os.close(os.open(base_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return base_file
+        except FileExistsError:
+            i += 1
+            base_file = output_path / f"{title}_{i}.{extension}"
+
+def convert_to_mp3(input_file, output_path, title, quality='medium'):
+    """
+    Convert an audio file to MP3 format using ffmpeg with the chosen LAME VBR quality on all cores.
+    Low quality uses the much faster fixed-point shine encoder at 128k when ffmpeg was built with it.
+    """
+    use_shine = False
+    if quality == 'low':
+        with _PROBE_LOCK:
+            use_shine = 'libshine' in list_ffmpeg_encoders()
+    if use_shine:
+        codec_options = ['-c:a', 'libshine', '-b:a', '128k']
+    else:
+        vbr_quality = MP3_VBR_QUALITIES.get(quality, 2)
+        codec_options = ['-c:a', 'libmp3lame', '-q:a', str(vbr_quality), '-threads', '0']
+
+    output_file = generate_unique_filename(output_path, title, 'mp3')
+    try:
+        subprocess.run(
+            [_FFMPEG_PATH, '-y', '-hide_banner', '-loglevel', 'error', '-i', str(input_file),
+             *codec_options, str(output_file)],
+            check=True,
+        )
+        logging.info(f"Conversion to MP3 with {quality} quality complete.")
+        return output_file
+    except subprocess.CalledProcessError as e:
+        logging.error(f"Conversion error: {e}")
+        output_file.unlink(missing_ok=True)
+        return None
+
+@functools.cache
+def list_ffmpeg_encoders():
+    """
+    Return the names of the encoders compiled into the installed ffmpeg.
+    Probed on first use and cached, so importing the package never starts ffmpeg.
+    """
+    if _FFMPEG_PATH is None:
+        return frozenset()
+    result = subprocess.run([_FFMPEG_PATH, '-hide_banner', '-encoders'], capture_output=True, text=True)
+    return frozenset(_ENCODER_LINE_RE.findall(result.stdout))
+
+@functools.cache
+def detect_hw_encoder():
+    """
+    Detect the best available H.264 encoder, preferring hardware encoders over libx264.
+    Only runs, once, when a video actually needs re-encoding.
+    """
+    for encoder in ('h264_nvenc', 'h264_amf', 'h264_qsv'):
+        if encoder not in list_ffmpeg_encoders():
+            continue
+        # Builds often list hardware encoders the machine has no device for, so try a single frame
+        check = subprocess.run(
+            [_FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-f', 'lavfi', '-i', 'color=black:s=256x256',
+             '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'],
+            capture_output=True,
+        )
+        if check.returncode == 0:
+            return encoder
+    return 'libx264'
+
+def ffmpeg_available():
+    """
+    Check whether both ffmpeg and ffprobe are installed.
+    """
+    return _FFMPEG_PATH is not None and _FFPROBE_PATH is not None
+
+def probe_media(input_file):
+    """
+    Return ffprobe's JSON description of the file's container and streams.
+    """
+    result = subprocess.run(
+        [_FFPROBE_PATH, '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', str(input_file)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+def is_mp4_file(input_file):
+    """
+    Check whether the file is named as an MP4. ffprobe reports MOV, M4A and 3GP with the same format name.
+    """
+    return pathlib.Path(input_file).suffix.lower() == '.mp4'
+
+def has_mp4_compatible_streams(input_file):
+    """
+    Check whether the file already holds H.264 video and AAC audio, so it needs at most a remux.
+    """
+    try:
+        probe = probe_media(input_file)
+    except subprocess.CalledProcessError as e:
+        logging.error(f"Probe error: {e}")
+        return False
+    streams = probe['streams']
+    video_codecs = {s['codec_name'] for s in streams if s['codec_type'] == 'video'}
+    audio_codecs = {s['codec_name'] for s in streams if s['codec_type'] == 'audio'}
+    return video_codecs == {'h264'} and audio_codecs <= {'aac'}
+
+def remux_to_mp4(input_file, output_file):
+    """
+    Copy H.264/AAC streams from another container into a faststart MP4 without re-encoding.
+    """
+    try:
+        subprocess.run(
+            [_FFMPEG_PATH, '-y', '-hide_banner', '-loglevel', 'error', '-i', str(input_file),
+             '-c', 'copy', '-movflags', '+faststart', str(output_file)],
+            check=True,
+        )
+        logging.info("Streams already MP4 compatible, copied without re-encoding.")
+        return output_file
+    except subprocess.CalledProcessError as e:
+        logging.error(f"Remux error: {e}")
+        return None
+
+def _encode_to_mp4(input_file, output_file, video_encoder, quality=None):
+    """
+    Run ffmpeg once with the given video encoder, raising CalledProcessError on failure.
+    """
+    encoder_options = ENCODER_OPTIONS.get(video_encoder, [])
+    if video_encoder == 'libx264':
+        encoder_options = ['-preset', X264_PRESETS.get(quality, 'ultrafast'), *encoder_options]
+    subprocess.run(
+        [_FFMPEG_PATH, '-y', '-hide_banner', '-loglevel', 'error',
+         *HWACCEL_OPTIONS.get(video_encoder, []), '-i', str(input_file),
+         '-c:v', video_encoder, *encoder_options,
+         '-c:a', 'aac', '-b:a', '192k', '-movflags', '+faststart', str(output_file)],
+        check=True,
+    )
+
+def reencode_to_mp4(input_file, output_file, quality=None):
+    """
+    Re-encode the video and audio to ensure compatibility with MP4.
+    The quality only affects libx264, which defaults to its fastest preset.
+    If a hardware encoder fails (e.g. 10-bit input or no free NVENC session), libx264 is tried once.
+    """
+    with _PROBE_LOCK:
+        video_encoder = detect_hw_encoder()
+    try:
+        _encode_to_mp4(input_file, output_file, video_encoder, quality)
+    except subprocess.CalledProcessError as e:
+        if video_encoder == 'libx264':
+            logging.error(f"Re-encoding error: {e}")
+            return None
+        logging.warning(f"Re-encoding with {video_encoder} failed, retrying with libx264: {e}")
+        video_encoder = 'libx264'
+        try:
+            _encode_to_mp4(input_file, output_file, video_encoder, quality)
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Re-encoding error: {e}")
+            return None
+    logging.info(f"Re-encoding to MP4 with {video_encoder} complete.")
+    return output_file